@@ -3,22 +3,28 @@ Notary server setup and management for the TLSNotary demo.
 """
 
 import os
-import tempfile
+import socket
+import threading
 from pathlib import Path
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric import ec
 from tlsnpy import PyNotary
 
 class NotaryServer:
     """Manages a TLSNotary server instance with automatic key generation."""
     
-    def __init__(self, host="127.0.0.1", port=7047):
+    DEFAULT_HOST = "127.0.0.1"
+    DEFAULT_PORT = 7047
+    
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
         """Initialize the notary server with default configuration."""
         self.host = host
         self.port = port
         self.data_dir = Path("demo_data")
         self.data_dir.mkdir(exist_ok=True)
         
+        # Readiness signalling
+        self._ready = threading.Event()
+        self._stopped = threading.Event()
+        
         # Key paths
         self.notary_key_path = self.data_dir / "notary_key.pem"
         self.notary_pub_key_path = self.data_dir / "notary_pub_key.pem"
@@ -44,8 +50,17 @@ class NotaryServer:
         
     def _generate_notary_keys(self):
         """Generate notary signing key pair using secp256k1 curve."""
+        # Deferred so warm starts with cached keys skip loading OpenSSL
+        import tempfile
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import ec
+        
+        # Temporary files written so far, removed again on failure
+        temp_paths = []
         try:
-            # Generate K256 (secp256k1) private key
+            # Generate K256 (secp256k1) private key. The notary server signs
+            # attestations with k256 ECDSA, so RSA or Ed25519 keys are rejected;
+            # EC keygen is already a single scalar draw, not a prime search.
             private_key = ec.generate_private_key(
                 ec.SECP256K1()  # Use secp256k1 curve as required
             )
@@ -66,52 +81,80 @@ class NotaryServer:
                 format=serialization.PublicFormat.SubjectPublicKeyInfo
             )
             
-            # Write keys atomically using temporary files
-            with tempfile.NamedTemporaryFile(mode='wb', delete=False) as tmp_private:
+            # Write keys atomically using temporary files in the data directory,
+            # so the rename stays on one filesystem
+            with tempfile.NamedTemporaryFile(mode='wb', dir=self.data_dir, delete=False) as tmp_private:
+                temp_paths.append(Path(tmp_private.name))
                 tmp_private.write(pem_private)
-                tmp_private.flush()
-                os.replace(tmp_private.name, self.notary_key_path)
+            os.replace(tmp_private.name, self.notary_key_path)
                 
-            with tempfile.NamedTemporaryFile(mode='wb', delete=False) as tmp_public:
+            with tempfile.NamedTemporaryFile(mode='wb', dir=self.data_dir, delete=False) as tmp_public:
+                temp_paths.append(Path(tmp_public.name))
                 tmp_public.write(pem_public)
-                tmp_public.flush()
-                os.replace(tmp_public.name, self.notary_pub_key_path)
+            os.replace(tmp_public.name, self.notary_pub_key_path)
                 
             print(f"Keys generated and saved to {self.data_dir}")
             
-            # Verify the keys can be loaded back
-            with open(self.notary_key_path, 'rb') as f:
-                loaded_private = serialization.load_pem_private_key(f.read(), password=None)
-                if not isinstance(loaded_private, ec.EllipticCurvePrivateKey):
-                    raise ValueError("Generated key is not an EC private key")
-                if not isinstance(loaded_private.curve, ec.SECP256K1):
-                    raise ValueError("Generated key is not using secp256k1 curve")
-                
-            with open(self.notary_pub_key_path, 'rb') as f:
-                loaded_public = serialization.load_pem_public_key(f.read())
-                if not isinstance(loaded_public, ec.EllipticCurvePublicKey):
-                    raise ValueError("Generated key is not an EC public key")
-                if not isinstance(loaded_public.curve, ec.SECP256K1):
-                    raise ValueError("Generated key is not using secp256k1 curve")
+            # Verify the keys can be loaded back (debug only)
+            if os.environ.get("TLSNPY_VERIFY_KEYS") == "1":
+                self._verify_notary_keys()
                 
         except Exception as e:
             print(f"Error generating keys: {e}")
             # Clean up any partially written files
-            for path in [self.notary_key_path, self.notary_pub_key_path]:
+            for path in [self.notary_key_path, self.notary_pub_key_path, *temp_paths]:
                 try:
                     path.unlink(missing_ok=True)
                 except Exception:
                     pass
             raise
     
+    def _verify_notary_keys(self):
+        """Check that the saved key pair loads back as secp256k1 keys."""
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import ec
+        
+        with open(self.notary_key_path, 'rb') as f:
+            loaded_private = serialization.load_pem_private_key(f.read(), password=None)
+            if not isinstance(loaded_private, ec.EllipticCurvePrivateKey):
+                raise ValueError("Generated key is not an EC private key")
+            if not isinstance(loaded_private.curve, ec.SECP256K1):
+                raise ValueError("Generated key is not using secp256k1 curve")
+            
+        with open(self.notary_pub_key_path, 'rb') as f:
+            loaded_public = serialization.load_pem_public_key(f.read())
+            if not isinstance(loaded_public, ec.EllipticCurvePublicKey):
+                raise ValueError("Generated key is not an EC public key")
+            if not isinstance(loaded_public.curve, ec.SECP256K1):
+                raise ValueError("Generated key is not using secp256k1 curve")
+    
+    def _probe_ready(self, stopped, probe_interval=0.01):
+        """Set the ready event once something accepts connections on the port."""
+        while not stopped.is_set():
+            try:
+                with socket.create_connection((self.host, self.port), timeout=1):
+                    self._ready.set()
+                    return
+            except OSError:
+                stopped.wait(probe_interval)
+    
     def start(self):
         """Start the notary server."""
         print(f"Starting notary server on {self.host}:{self.port}")
+        self._ready.clear()
+        # A fresh stop event per start, so probes from earlier starts stay stopped
+        self._stopped = threading.Event()
         self.server.start()
+        threading.Thread(target=self._probe_ready, args=(self._stopped,), daemon=True).start()
+        
+    def wait_ready(self, timeout=None):
+        """Block until the server port accepts connections; return False on timeout."""
+        return self._ready.wait(timeout)
         
     def stop(self):
         """Stop the notary server."""
         print("Stopping notary server...")
+        self._stopped.set()
         self.server.stop()
         
     def __enter__(self):
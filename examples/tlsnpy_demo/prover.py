@@ -2,41 +2,54 @@
 Prover setup and API request proving for the TLSNotary demo.
 """
 
+import functools
+import os
+import socket
 import time
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from tlsnpy import PyProver
+from .notary import NotaryServer
+
+@functools.lru_cache(maxsize=None)
+def _ensure_dir(path):
+    """Create a directory once per process and return it."""
+    path.mkdir(exist_ok=True)
+    return path
+
+@functools.lru_cache(maxsize=None)
+def _host_and_port(url):
+    """Split a URL into its host and port, defaulting to HTTPS."""
+    parsed = urllib.parse.urlparse(url)
+    if not parsed.hostname:
+        raise ValueError(f"URL has no host: {url!r}")
+    return parsed.hostname, parsed.port or 443
 
 class APIProver:
     """Manages a TLSNotary prover instance for proving API responses."""
     
-    def __init__(self, notary_host="127.0.0.1", notary_port=7047):
+    def __init__(self, notary_host=NotaryServer.DEFAULT_HOST, notary_port=NotaryServer.DEFAULT_PORT):
         """Initialize the prover with connection to notary server."""
         self.notary_host = notary_host
         self.notary_port = notary_port
-        self.data_dir = Path("demo_data")
-        self.data_dir.mkdir(exist_ok=True)
+        self.data_dir = _ensure_dir(Path("demo_data"))
         
-    def _retry_operation(self, operation, max_retries=3, retry_delay=1):
-        """Retry an operation with exponential backoff."""
-        last_error = None
-        for attempt in range(max_retries):
+    def _retry_operation(self, operation, total_timeout=5, poll_interval=0.05):
+        """Retry an operation on transient connection failures until a deadline."""
+        deadline = time.monotonic() + total_timeout
+        while True:
             try:
                 return operation()
-            except Exception as e:
-                last_error = e
-                if attempt < max_retries - 1:
-                    delay = retry_delay * (2 ** attempt)
-                    print(f"Attempt {attempt + 1} failed, retrying in {delay} seconds...")
-                    time.sleep(delay)
-        raise last_error
+            except (ConnectionRefusedError, TimeoutError, socket.timeout):
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(poll_interval)
         
     def prove_request(self, url):
         """Prove a GET request to the specified URL."""
-        # Parse URL to get host and path
-        parsed = urllib.parse.urlparse(url)
-        host = parsed.netloc
-        port = 443  # Always use HTTPS
+        # Parse URL to get host and port
+        host, port = _host_and_port(url)
         
         # Create prover instance
         prover = PyProver(
@@ -46,13 +59,28 @@ class APIProver:
         )
         
         try:
-            # Initialize connection with retries
-            print("Setting up prover...")
-            self._retry_operation(lambda: prover.reset())
+            # Resolve the server address while the prover sets up
+            executor = ThreadPoolExecutor(max_workers=1)
+            try:
+                resolving = executor.submit(
+                    socket.getaddrinfo, host, port, type=socket.SOCK_STREAM
+                )
+                
+                # Initialize connection with retries
+                print("Setting up prover...")
+                self._retry_operation(lambda: prover.reset())
+                
+                # Resolution failures (socket.gaierror) are not retried: they are
+                # not transient, and connect() could not be retried anyway
+                address = resolving.result()[0][4][0]
+            finally:
+                # Don't hold up a reset() failure on a slow resolver
+                executor.shutdown(wait=False)
             
-            # Connect to server with retries
+            # Connect to server; not retried, as a failed connect consumes
+            # the prover state set up by reset()
             print(f"Connecting to {host}...")
-            self._retry_operation(lambda: prover.connect(host, port))
+            prover.connect(address, port)
             
             # Start notarization
             print("Starting notarization...")
@@ -64,8 +92,14 @@ class APIProver:
             
             # Save proof
             proof_path = self.data_dir / "api_response.proof"
-            with open(proof_path, "wb") as f:
-                f.write(proof)
+            fd = os.open(proof_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                # os.write may write fewer bytes than requested
+                view = memoryview(proof)
+                while view:
+                    view = view[os.write(fd, view):]
+            finally:
+                os.close(fd)
                 
             print(f"Proof saved to {proof_path}")
             return proof_path
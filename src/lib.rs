@@ -1,6 +1,7 @@
 use pyo3::prelude::*;
-use pyo3::exceptions::PyRuntimeError;
+use pyo3::exceptions::{PyConnectionRefusedError, PyRuntimeError, PyTimeoutError};
 
+use std::io;
 use std::net::ToSocketAddrs;
 
 use tokio::runtime::Runtime;
@@ -20,6 +21,24 @@ use notary_server::{
 
 use tokio_util::compat::TokioAsyncReadCompatExt;
 
+/// Converts a network operation failure into a Python exception.
+///
+/// Refused connections and timeouts anywhere in the error chain map to
+/// `ConnectionRefusedError` and `TimeoutError` so callers can retry them;
+/// everything else stays a `RuntimeError`.
+fn network_error(context: &str, e: anyhow::Error) -> PyErr {
+    let message = format!("{context}: {e}");
+    let kind = e
+        .chain()
+        .find_map(|cause| cause.downcast_ref::<io::Error>())
+        .map(io::Error::kind);
+    match kind {
+        Some(io::ErrorKind::ConnectionRefused) => PyConnectionRefusedError::new_err(message),
+        Some(io::ErrorKind::TimedOut) => PyTimeoutError::new_err(message),
+        _ => PyRuntimeError::new_err(message),
+    }
+}
+
 /// A Python-friendly wrapper around the TLS Notary Prover.
 /// 
 /// # Thread Safety
@@ -89,7 +108,7 @@ impl PyProver {
 
             let setup = Prover::new(config).setup(accepted.io.compat()).await?;
             Ok::<_, anyhow::Error>(setup)
-        }).map_err(|e| PyRuntimeError::new_err(format!("Setup failed: {e}")))?;
+        }).map_err(|e| network_error("Setup failed", e))?;
 
         self.inner = Some(ProverState::Setup(prover));
         Ok(())
@@ -110,7 +129,7 @@ impl PyProver {
             let (_, fut) = prover.connect(conn.compat()).await?;
             let closed = fut.await?;
             Ok::<_, anyhow::Error>(closed)
-        }).map_err(|e| PyRuntimeError::new_err(format!("Connect failed: {e}")))?;
+        }).map_err(|e| network_error("Connect failed", e))?;
 
         self.inner = Some(ProverState::Closed(closed));
         Ok(())